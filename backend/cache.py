@@ -0,0 +1,120 @@
+"""
+Redis cache-aside layer for per-user GET endpoints.
+
+Caching is optional: without REDIS_URL, or while Redis is unreachable,
+every lookup is a miss and writes are dropped, so the API keeps serving
+straight from the database.
+"""
+
+import os
+import json
+import logging
+from functools import wraps
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+
+class RedisCache:
+    """Thin JSON wrapper around a pooled async Redis client."""
+
+    def __init__(self):
+        self._client: Optional[redis.Redis] = None
+
+    async def connect(self, url: Optional[str]) -> None:
+        if not url:
+            return
+        # Short timeouts so an unreachable Redis degrades to cache misses quickly
+        pool = redis.ConnectionPool.from_url(
+            url,
+            max_connections=20,
+            decode_responses=True,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        )
+        self._client = redis.Redis(connection_pool=pool)
+
+    @property
+    def enabled(self) -> bool:
+        """False when no REDIS_URL was configured; every call is then a no-op."""
+        return self._client is not None
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        if self._client is None:
+            return None
+        try:
+            raw = await self._client.get(key)
+        except (redis.RedisError, OSError) as e:
+            logger.warning("Redis get failed for %s: %s", key, e)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, expire: Optional[int] = None) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.set(key, json.dumps(value, default=str), ex=expire)
+        except (redis.RedisError, OSError) as e:
+            logger.warning("Redis set failed for %s: %s", key, e)
+
+    async def delete(self, *keys: str) -> None:
+        if self._client is None or not keys:
+            return
+        try:
+            await self._client.delete(*keys)
+        except (redis.RedisError, OSError) as e:
+            logger.warning("Redis delete failed for %s: %s", keys, e)
+
+    async def delete_pattern(self, pattern: str) -> None:
+        """
+        Delete every key matching a glob pattern, e.g. 'cogprof:42:*'.
+        
+        SCANs the whole keyspace, so keep it out of request paths; invalidate
+        @cached entries with cache.delete(endpoint.key_for(user_id)) instead.
+        """
+        if self._client is None:
+            return
+        try:
+            keys = [key async for key in self._client.scan_iter(match=pattern)]
+            if keys:
+                await self._client.delete(*keys)
+        except (redis.RedisError, OSError) as e:
+            logger.warning("Redis delete_pattern failed for %s: %s", pattern, e)
+
+
+cache = RedisCache()
+
+
+def cached(prefix: str, expire: int = 60):
+    """
+    Cache an endpoint's JSON result per user.
+
+    The key is '{prefix}:{user_id}:{endpoint}'. The decorated endpoint gets a
+    `key_for(user_id)` helper so writers can delete the exact key without
+    scanning. The endpoint must take the authenticated user as `current_user`.
+    """
+    def decorator(func):
+        def key_for(user_id: int) -> str:
+            return f"{prefix}:{user_id}:{func.__name__}"
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = key_for(kwargs['current_user'].id)
+            hit = await cache.get(key)
+            if hit is not None:
+                return hit
+            result = await func(*args, **kwargs)
+            await cache.set(key, result, expire=expire)
+            return result
+        wrapper.key_for = key_for
+        return wrapper
+    return decorator
@@ -5,7 +5,9 @@ from sqlalchemy.orm import sessionmaker
 SQLALCHEMY_DATABASE_URL = "sqlite:///./neuroadaptive.db"
 
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    query_cache_size=1200
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
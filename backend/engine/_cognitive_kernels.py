@@ -0,0 +1,55 @@
+"""
+Compiled kernels for the cognitive feature extractor.
+Numba is optional; when it is missing HAS_NUMBA is False and the
+kernel below runs as plain Python with identical results.
+"""
+
+import math
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in so the kernel below still defines as plain Python."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True)
+def _extract(times, correct, retry, conf):
+    """
+    Single fused pass over the event arrays.
+
+    No fastmath: the sums must accumulate in order so the results match
+    cognitive._reduce_events exactly (features are rounded to 2dp, and a
+    reassociated sum can land on the other side of a rounding boundary).
+
+    The mean is a plain sum / n; Welford's update is used for the
+    response-time variance so it stays stable for long, tightly
+    clustered histories.
+
+    Returns:
+        (mean_time, std_time, mean_correct, mean_retry, mean_confidence)
+    """
+    n = times.shape[0]
+    sum_t = 0.0
+    mean_t = 0.0
+    m2 = 0.0
+    sum_correct = 0.0
+    sum_retry = 0.0
+    sum_conf = 0.0
+    for i in range(n):
+        sum_t += times[i]
+        delta = times[i] - mean_t
+        mean_t += delta / (i + 1)
+        m2 += delta * (times[i] - mean_t)
+        sum_correct += correct[i]
+        sum_retry += retry[i]
+        sum_conf += conf[i]
+
+    std_t = math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+    return sum_t / n, std_t, sum_correct / n, sum_retry / n, sum_conf / n
@@ -1,31 +1,59 @@
-def generate_chat_response(message: str, context: dict):
-    msg = message.lower()
+import re
 
-    cognitive = context.get("cognitive_profile")
+# One scan finds every intent keyword. "hi" must end a word so it does not
+# match inside "this" or "high"; the others also match longer word forms
+# like "plans" or "studying".
+_INTENT_RE = re.compile(r"\b(energy|cognitive|learning style|study|plan|hello|hi\b)")
+
+DEFAULT_REPLY = "I'm still learning. Try asking about energy, cognitive profile, or study plans."
+
+
+def _energy_reply(context: dict) -> str:
     energy = context.get("energy")
+    if not energy:
+        return "You haven't logged your energy yet. Try logging sleep and tiredness."
+    return (
+        f"Your current energy level is {energy['energy_level']} "
+        f"with a score of {energy['energy_score']}. "
+        "I recommend revision or light study."
+    )
+
+
+def _cognitive_reply(context: dict) -> str:
+    cognitive = context.get("cognitive_profile")
+    if not cognitive:
+        return "You don't have a cognitive profile yet. Take a cognitive assessment."
+    return (
+        f"Your learning style is **{cognitive['type']}** "
+        f"with confidence {int(cognitive['confidence'] * 100)}%."
+    )
+
 
+def _plan_reply(context: dict) -> str:
+    return "I can help you generate a study plan based on your energy and cognition."
+
+
+def _greeting_reply(context: dict) -> str:
+    return "Hey 👋 I'm your study assistant. Ask me about energy, cognition, or plans."
+
+
+# Keyword -> (priority, handler); lower priority wins when several match
+_HANDLERS = {
+    "energy": (0, _energy_reply),
+    "cognitive": (1, _cognitive_reply),
+    "learning style": (1, _cognitive_reply),
+    "study": (2, _plan_reply),
+    "plan": (2, _plan_reply),
+    "hello": (3, _greeting_reply),
+    "hi": (3, _greeting_reply),
+}
+
+
+def generate_chat_response(message: str, context: dict):
     # Simple intent detection
-    if "energy" in msg:
-        if not energy:
-            return "You haven't logged your energy yet. Try logging sleep and tiredness."
-        return (
-            f"Your current energy level is {energy['energy_level']} "
-            f"with a score of {energy['energy_score']}. "
-            "I recommend revision or light study."
-        )
-
-    if "cognitive" in msg or "learning style" in msg:
-        if not cognitive:
-            return "You don't have a cognitive profile yet. Take a cognitive assessment."
-        return (
-            f"Your learning style is **{cognitive['type']}** "
-            f"with confidence {int(cognitive['confidence'] * 100)}%."
-        )
-
-    if "study" in msg or "plan" in msg:
-        return "I can help you generate a study plan based on your energy and cognition."
-
-    if "hello" in msg or "hi" in msg:
-        return "Hey 👋 I'm your study assistant. Ask me about energy, cognition, or plans."
-
-    return "I'm still learning. Try asking about energy, cognitive profile, or study plans."
+    matches = _INTENT_RE.findall(message.lower())
+    if not matches:
+        return DEFAULT_REPLY
+
+    intent = min(matches, key=lambda m: _HANDLERS[m][0])
+    return _HANDLERS[intent][1](context)
@@ -3,46 +3,91 @@ Cognitive Profile Classifier - Phase 1 (Rule-based Stub)
 Classifies students into cognitive profiles based on quiz performance.
 """
 
+import math
 from typing import List, Dict, Any
-from statistics import mean, stdev
+import numpy as np
 
+from ._cognitive_kernels import _extract
 
-def extract_cognitive_features(events: List[Dict[str, Any]]) -> Dict[str, float]:
+
+def rows_to_arrays(rows) -> Dict[str, np.ndarray]:
     """
-    Extract cognitive features from the last N events.
+    Convert (id, time_taken, correct, retry_count, confidence) rows, e.g. from
+    a columnar SELECT, into the arrays used by classify_cognitive_arrays.
     
-    Features:
-    - avg_response_time: Mean seconds per question
-    - accuracy_rate: Percentage correct
-    - retry_pattern: Frequency of repeated attempts
-    - confidence_gap: Difference between actual vs self-reported confidence
-    - speed_consistency: Standard deviation of response times
+    All five columns are copied in one np.array call; no per-event dicts.
+    The ids are kept so callers can identify the window (see
+    scheduler._profile_cache_key).
     """
-    if not events:
-        return {
-            "avg_response_time": 0.0,
-            "accuracy_rate": 0.0,
-            "retry_pattern": 0.0,
-            "confidence_gap": 0.0,
-            "speed_consistency": 0.0
-        }
+    table = np.array(rows, dtype=np.float64).reshape(-1, 5)
+    ids, times, correct, retry, confidence = table.T.copy()
+    return {
+        "ids": ids.astype(np.int64),
+        "times": times,
+        "correct": correct,
+        "retry": retry,
+        "confidence": confidence
+    }
+
+
+def _reduce_events(events: List[Dict[str, Any]]) -> tuple:
+    """
+    Single pass over event dicts, accumulating every reduction at once.
     
-    times = [e["time_taken"] for e in events]
-    correct_count = sum(1 for e in events if e["correct"])
-    total = len(events)
+    Mirrors _cognitive_kernels._extract (Welford update for the time
+    variance). For dict input this is faster than converting to arrays
+    first, even with the compiled kernel.
+    """
+    sum_t = 0.0
+    mean_t = 0.0
+    m2 = 0.0
+    correct_count = 0
+    sum_retry = 0
+    sum_conf = 0
+    n = 0
+    for e in events:
+        n += 1
+        t = e["time_taken"]
+        sum_t += t
+        delta = t - mean_t
+        mean_t += delta / n
+        m2 += delta * (t - mean_t)
+        if e["correct"]:
+            correct_count += 1
+        sum_retry += e.get("retry_count") or 0
+        sum_conf += e["confidence"]
     
-    avg_response_time = mean(times) if times else 0.0
-    accuracy_rate = correct_count / total if total > 0 else 0.0
+    std_t = math.sqrt(m2 / (n - 1)) if n > 1 else 0.0
+    return sum_t / n, std_t, correct_count / n, sum_retry / n, sum_conf / n
+
+
+def _reduce_arrays(arrays: Dict[str, np.ndarray]) -> tuple:
+    """
+    Same reductions as _reduce_events, over columnar arrays.
     
-    # Retry pattern (average retry count)
-    retry_pattern = mean([e.get("retry_count", 0) for e in events])
+    One fused pass; compiled when numba is installed, plain Python otherwise.
+    """
+    stats = _extract(arrays["times"], arrays["correct"], arrays["retry"], arrays["confidence"])
+    return tuple(float(x) for x in stats)
+
+
+_EMPTY_FEATURES = {
+    "avg_response_time": 0.0,
+    "accuracy_rate": 0.0,
+    "retry_pattern": 0.0,
+    "confidence_gap": 0.0,
+    "speed_consistency": 0.0
+}
+
+
+def _features_from_stats(stats: tuple) -> Dict[str, float]:
+    """Turn the raw reductions into the rounded feature dict."""
+    # Retry pattern is the average retry count; speed consistency is the
+    # std of response times (lower = more consistent)
+    avg_response_time, speed_consistency, accuracy_rate, retry_pattern, avg_confidence = stats
     
     # Confidence gap: difference between accuracy and avg confidence (normalized 0-1)
-    avg_confidence = mean([e["confidence"] for e in events]) / 5.0
-    confidence_gap = abs(accuracy_rate - avg_confidence)
-    
-    # Speed consistency (lower = more consistent)
-    speed_consistency = stdev(times) if len(times) > 1 else 0.0
+    confidence_gap = abs(accuracy_rate - avg_confidence / 5.0)
     
     return {
         "avg_response_time": round(avg_response_time, 2),
@@ -53,28 +98,31 @@ def extract_cognitive_features(events: List[Dict[str, Any]]) -> Dict[str, float]
     }
 
 
-def classify_cognitive_profile(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+def extract_cognitive_features(events: List[Dict[str, Any]]) -> Dict[str, float]:
     """
-    Classify cognitive profile using rule-based logic (Phase 1).
-    
-    Profiles:
-    - struggling: accuracy < 0.5
-    - fast_careless: avg_time < 12 AND accuracy < 0.75
-    - slow_accurate: avg_time > 20 AND accuracy > 0.8
-    - balanced: default
+    Extract cognitive features from the last N events.
     
-    Returns:
-        {
-            "type": "balanced",
-            "confidence": 0.85,
-            "features": {...}
-        }
+    Features:
+    - avg_response_time: Mean seconds per question
+    - accuracy_rate: Percentage correct
+    - retry_pattern: Frequency of repeated attempts
+    - confidence_gap: Difference between actual vs self-reported confidence
+    - speed_consistency: Standard deviation of response times
     """
-    features = extract_cognitive_features(events)
-    
-    accuracy = features["accuracy_rate"]
-    avg_time = features["avg_response_time"]
-    
+    if not events:
+        return dict(_EMPTY_FEATURES)
+    return _features_from_stats(_reduce_events(events))
+
+
+def _features_from_arrays(arrays: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """extract_cognitive_features for columnar input (see rows_to_arrays)."""
+    if not arrays["times"].size:
+        return dict(_EMPTY_FEATURES)
+    return _features_from_stats(_reduce_arrays(arrays))
+
+
+def _profile_from_stats(accuracy: float, avg_time: float, sample_size: int) -> Dict[str, Any]:
+    """Apply the Phase 1 rules to the two discriminating features."""
     # Rule-based classification
     if accuracy < 0.5:
         profile_type = "struggling"
@@ -90,7 +138,6 @@ def classify_cognitive_profile(events: List[Dict[str, Any]]) -> Dict[str, Any]:
         confidence = 0.8
     
     # Adjust confidence based on sample size
-    sample_size = len(events)
     if sample_size < 10:
         confidence *= 0.7  # Lower confidence with fewer samples
     elif sample_size < 20:
@@ -98,11 +145,45 @@ def classify_cognitive_profile(events: List[Dict[str, Any]]) -> Dict[str, Any]:
     
     return {
         "type": profile_type,
-        "confidence": round(confidence, 2),
-        "features": features
+        "confidence": round(confidence, 2)
     }
 
 
+def classify_cognitive_profile(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Classify cognitive profile using rule-based logic (Phase 1).
+    
+    Profiles:
+    - struggling: accuracy < 0.5
+    - fast_careless: avg_time < 12 AND accuracy < 0.75
+    - slow_accurate: avg_time > 20 AND accuracy > 0.8
+    - balanced: default
+    
+    Returns:
+        {
+            "type": "balanced",
+            "confidence": 0.85,
+            "features": {...}
+        }
+    """
+    return _classify(extract_cognitive_features(events), len(events))
+
+
+def classify_cognitive_arrays(arrays: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """classify_cognitive_profile for columnar input (see rows_to_arrays)."""
+    return _classify(_features_from_arrays(arrays), arrays["times"].size)
+
+
+def _classify(features: Dict[str, float], sample_size: int) -> Dict[str, Any]:
+    profile = _profile_from_stats(
+        features["accuracy_rate"],
+        features["avg_response_time"],
+        sample_size
+    )
+    profile["features"] = features
+    return profile
+
+
 def get_intervention_recommendation(profile_type: str) -> str:
     """Get intervention recommendation based on cognitive profile."""
     interventions = {
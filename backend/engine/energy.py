@@ -5,8 +5,35 @@ Calculates energy levels based on sleep and tiredness inputs.
 
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
+from functools import lru_cache
+from bisect import bisect_right
+import heapq
+import numpy as np
 
 
+# Lower bounds of the medium and high energy levels
+_LEVEL_BUCKETS = (40, 70)
+_LEVELS = ("low", "medium", "high")
+
+# Recommended/avoided activities per energy level (PRD Appendix B).
+# Returned by reference, so callers must not mutate them.
+_RECOMMENDATIONS = {
+    "high": {
+        "recommended": ["New concepts", "Hard problems", "Active recall"],
+        "avoid": ["Passive reading", "Easy revision"]
+    },
+    "medium": {
+        "recommended": ["Practice problems", "Note-making", "Discussion"],
+        "avoid": ["Extremely difficult topics"]
+    },
+    "low": {
+        "recommended": ["Revision", "Flashcards", "Light reading"],
+        "avoid": ["Learning new material"]
+    }
+}
+
+
+@lru_cache(maxsize=256)
 def calculate_energy_score(sleep_hours: float, tiredness: int) -> int:
     """
     Calculate energy score using formula from PRD.
@@ -21,8 +48,9 @@ def calculate_energy_score(sleep_hours: float, tiredness: int) -> int:
     Returns:
         Energy score (0-100)
     """
-    score = (sleep_hours * 12) - (tiredness * 10)
-    return max(0, min(100, int(score)))
+    # Integer math; truncating sleep first gives the same clamped result
+    score = int(sleep_hours * 12) - tiredness * 10
+    return 0 if score < 0 else 100 if score > 100 else score
 
 
 def get_energy_level(energy_score: int) -> str:
@@ -33,22 +61,23 @@ def get_energy_level(energy_score: int) -> str:
     - Medium (40-69): Normal functioning
     - Low (0-39): Reduced capacity
     """
-    if energy_score >= 70:
-        return "high"
-    elif energy_score >= 40:
-        return "medium"
-    else:
-        return "low"
+    return _LEVELS[bisect_right(_LEVEL_BUCKETS, energy_score)]
 
 
-def calculate_fatigue_index(tiredness: int, sleep_hours: float) -> float:
+def _fatigue_indices(tiredness, sleep_hours):
     """
-    Calculate fatigue index from PRD FR2.2.
+    Fatigue index from PRD FR2.2, element-wise over scalars or NumPy arrays.
     
-    Formula: (tiredness × 0.6) + ((7 - sleep) × 0.4)
+    Formula: (tiredness × 0.6) + ((7 - sleep) × 0.4), floored at 0 and
+    rounded to 2 decimals.
     """
     fatigue = (tiredness * 0.6) + ((7 - sleep_hours) * 0.4)
-    return round(max(0, fatigue), 2)
+    return np.round(np.maximum(0, fatigue), 2)
+
+
+def calculate_fatigue_index(tiredness: int, sleep_hours: float) -> float:
+    """Calculate fatigue index from PRD FR2.2 (see _fatigue_indices)."""
+    return float(_fatigue_indices(tiredness, sleep_hours))
 
 
 def calculate_burnout_risk(energy_logs: List[Dict[str, Any]], window_days: int = 7) -> float:
@@ -65,21 +94,17 @@ def calculate_burnout_risk(energy_logs: List[Dict[str, Any]], window_days: int =
     if not energy_logs:
         return 0.5  # Default moderate risk when no data
     
-    # Sort by timestamp (most recent first)
-    sorted_logs = sorted(
-        energy_logs, 
-        key=lambda x: x.get("timestamp", datetime.min), 
-        reverse=True
+    # Take the most recent logs from the window without a full sort
+    recent_logs = heapq.nlargest(
+        window_days,
+        energy_logs,
+        key=lambda x: x.get("timestamp", datetime.min)
     )
     
-    # Take logs from window
-    recent_logs = sorted_logs[:window_days]
-    
     # Calculate trend in fatigue
-    fatigue_scores = [
-        calculate_fatigue_index(log["tiredness"], log["sleep_hours"])
-        for log in recent_logs
-    ]
+    tiredness = np.fromiter((log["tiredness"] for log in recent_logs), dtype=np.float64)
+    sleep = np.fromiter((log["sleep_hours"] for log in recent_logs), dtype=np.float64)
+    fatigue_scores = _fatigue_indices(tiredness, sleep)
     
     if len(fatigue_scores) < 2:
         return 0.3  # Low risk with insufficient data
@@ -87,7 +112,7 @@ def calculate_burnout_risk(energy_logs: List[Dict[str, Any]], window_days: int =
     # Calculate slope (positive = increasing fatigue = higher risk)
     # Simple linear approximation
     n = len(fatigue_scores)
-    avg_fatigue = sum(fatigue_scores) / n
+    avg_fatigue = sum(fatigue_scores.tolist()) / n
     
     # Higher average fatigue = higher burnout risk
     # Scale to 0-1
@@ -101,21 +126,7 @@ def get_recommended_activities(energy_level: str) -> Dict[str, List[str]]:
     Get recommended and avoided activities based on energy level.
     From PRD Appendix B.
     """
-    recommendations = {
-        "high": {
-            "recommended": ["New concepts", "Hard problems", "Active recall"],
-            "avoid": ["Passive reading", "Easy revision"]
-        },
-        "medium": {
-            "recommended": ["Practice problems", "Note-making", "Discussion"],
-            "avoid": ["Extremely difficult topics"]
-        },
-        "low": {
-            "recommended": ["Revision", "Flashcards", "Light reading"],
-            "avoid": ["Learning new material"]
-        }
-    }
-    return recommendations.get(energy_level, recommendations["medium"])
+    return _RECOMMENDATIONS.get(energy_level, _RECOMMENDATIONS["medium"])
 
 
 def get_energy_analysis(sleep_hours: float, tiredness: int) -> Dict[str, Any]:
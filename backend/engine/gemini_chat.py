@@ -1,32 +1,61 @@
 import os
+import logging
 import google.generativeai as genai
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 
-model = genai.GenerativeModel("models/gemini-2.5-flash")
+# Only one candidate is ever read, so don't request more
+model = genai.GenerativeModel(
+    "models/gemini-2.5-flash",
+    generation_config=genai.types.GenerationConfig(candidate_count=1)
+)
 
-def generate_gemini_response(message: str, context: dict):
-    try:
-        response = model.generate_content(
-            f"""
+_PROMPT_CONTEXT = """
 You are a helpful study assistant.
 
 Context:
-Cognitive profile: {context.get("cognitive_profile")}
-Energy: {context.get("energy")}
-
-User: {message}
+Cognitive profile: {cognitive_profile}
+Energy: {energy}
 """
-        )
+
+# Identical prompts within 5 minutes reuse the previous reply
+_response_cache = TTLCache(maxsize=512, ttl=300)
+
+
+def render_prompt_context(context: dict) -> str:
+    """Everything in the prompt except the user's message; cache it per user."""
+    return _PROMPT_CONTEXT.format(
+        cognitive_profile=context.get("cognitive_profile"),
+        energy=context.get("energy")
+    )
+
+
+async def generate_gemini_response(message: str, prompt_context: str):
+    key = (message, prompt_context)
+    cached = _response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    prompt = f"{prompt_context}\nUser: {message}\n"
+
+    try:
+        # Async client call so the event loop keeps serving other requests
+        response = await model.generate_content_async(prompt)
 
         if not response or not response.candidates:
             return "I couldn't generate a response. Please try again."
 
-        return response.text
+        # Only successful replies are cached; errors are retried next time
+        reply = response.text
+        _response_cache[key] = reply
+        return reply
 
     except Exception as e:
-        print("❌ Gemini error:", e)
+        logger.warning("Gemini request failed: %s", e)
         return "AI service is temporarily unavailable."
@@ -3,9 +3,15 @@ Study Optimization Scheduler - Phase 1 (Greedy with Lookahead)
 Generates personalized study schedules based on cognitive profile and energy state.
 """
 
+import re
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import cycle
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
-from .cognitive import classify_cognitive_profile
+from datetime import date, timedelta
+import numpy as np
+from .cognitive import classify_cognitive_arrays
 from .energy import get_energy_level, calculate_energy_score
 
 
@@ -45,13 +51,124 @@ INTENSITY_BY_DIFFICULTY = {
     "easy": "Low"
 }
 
+# Energy match: align difficulty with energy level
+ENERGY_MATCH_MAP = {
+    "high": {"hard": 1.0, "medium": 0.7, "easy": 0.3},
+    "medium": {"hard": 0.5, "medium": 1.0, "easy": 0.7},
+    "low": {"hard": 0.2, "medium": 0.5, "easy": 1.0}
+}
+
+# Cognitive fit: some profiles handle certain difficulties better
+COGNITIVE_FIT_MAP = {
+    "struggling": {"hard": 0.3, "medium": 0.7, "easy": 1.0},
+    "fast_careless": {"hard": 0.7, "medium": 1.0, "easy": 0.5},
+    "slow_accurate": {"hard": 1.0, "medium": 0.8, "easy": 0.5},
+    "balanced": {"hard": 0.8, "medium": 1.0, "easy": 0.8}
+}
+
+# energy_match × cognitive_fit for every known combination
+_SCORE_TABLE = {
+    (energy_level, profile_type, difficulty): energy_map[difficulty] * fit_map[difficulty]
+    for energy_level, energy_map in ENERGY_MATCH_MAP.items()
+    for profile_type, fit_map in COGNITIVE_FIT_MAP.items()
+    for difficulty in ("hard", "medium", "easy")
+}
+
+# DEFAULT_TOPICS flattened into parallel arrays indexed by topic id
+_DIFFICULTIES = ("easy", "medium", "hard")
+_TOPIC_SUBJECTS = [
+    subject for subject, topics in DEFAULT_TOPICS.items() for _ in topics
+]
+_TOPIC_NAMES = [
+    topic["name"] for topics in DEFAULT_TOPICS.values() for topic in topics
+]
+_TOPIC_WEIGHTS = np.array(
+    [topic["weight"] for topics in DEFAULT_TOPICS.values() for topic in topics],
+    dtype=np.float64
+)
+_TOPIC_DIFF_IDX = np.array(
+    [_DIFFICULTIES.index(topic["difficulty"]) for topics in DEFAULT_TOPICS.values() for topic in topics],
+    dtype=np.int8
+)
+_SUBJECT_TOPIC_IDS = {}
+for _topic_id, _subject in enumerate(_TOPIC_SUBJECTS):
+    _SUBJECT_TOPIC_IDS.setdefault(_subject, []).append(_topic_id)
+_SUBJECT_TOPIC_IDS = {
+    subject: np.array(ids, dtype=np.intp) for subject, ids in _SUBJECT_TOPIC_IDS.items()
+}
+
+# energy_match × cognitive_fit by difficulty index, per (energy_level, profile_type)
+_SCORE_MULTIPLIERS = {
+    (energy_level, profile_type): np.array(
+        [_SCORE_TABLE[(energy_level, profile_type, d)] for d in _DIFFICULTIES],
+        dtype=np.float64
+    )
+    for energy_level in ENERGY_MATCH_MAP
+    for profile_type in COGNITIVE_FIT_MAP
+}
+
+# Rationale phrases; every combination is pre-rendered into _RATIONALE
+_ENERGY_PHRASES = {
+    "high": "Peak energy",
+    "medium": "Moderate energy",
+    "low": "Low energy"
+}
+_MASTERY_BUCKETS = (0.4, 0.7)
+_STRENGTHS = ("weak topic", "developing topic", "strong topic")
+_PROFILE_CONTEXT = {
+    "struggling": "needs foundational review",
+    "fast_careless": "focus on accuracy",
+    "slow_accurate": "speed practice beneficial",
+    "balanced": "optimal learning conditions"
+}
+_RATIONALE = {
+    (energy_level, bucket, profile_type): f"{energy_phrase} + {strength} - {context}"
+    for energy_level, energy_phrase in _ENERGY_PHRASES.items()
+    for bucket, strength in enumerate(_STRENGTHS)
+    for profile_type, context in _PROFILE_CONTEXT.items()
+}
+
+# Recently classified event windows, keyed by _profile_cache_key
+_PROFILE_CACHE = OrderedDict()
+_PROFILE_CACHE_SIZE = 256
+
+# "HH:MM-HH:MM"; only the hours are used
+_SLOT_RE = re.compile(r"\s*(\d{1,2})(?::\d{2})?\s*-\s*(\d{1,2})(?::\d{2})?\s*$")
+
+
+def _profile_cache_key(events: Dict[str, np.ndarray]) -> Optional[tuple]:
+    """Cheap identity for an event window: its length plus the ids at both ends."""
+    ids = events["ids"]
+    if not ids.size:
+        return None
+    return ids.size, int(ids[0]), int(ids[-1])
+
+
+def _get_cognitive_profile(events: Dict[str, np.ndarray]) -> Dict[str, Any]:
+    """classify_cognitive_arrays with a small LRU cache for repeated plans."""
+    key = _profile_cache_key(events)
+    if key is None:
+        return classify_cognitive_arrays(events)
+    
+    profile = _PROFILE_CACHE.get(key)
+    if profile is not None:
+        _PROFILE_CACHE.move_to_end(key)
+        return profile
+    
+    profile = classify_cognitive_arrays(events)
+    _PROFILE_CACHE[key] = profile
+    if len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+        _PROFILE_CACHE.popitem(last=False)
+    return profile
+
 
+@lru_cache(maxsize=256)
 def parse_time_slot(slot: str) -> tuple:
     """Parse time slot string like '18:00-21:00' into start and end hours."""
-    parts = slot.split("-")
-    start = int(parts[0].split(":")[0])
-    end = int(parts[1].split(":")[0])
-    return start, end
+    match = _SLOT_RE.match(slot)
+    if not match:
+        raise ValueError(f"Invalid time slot: {slot!r}")
+    return int(match.group(1)), int(match.group(2))
 
 
 def calculate_topic_score(
@@ -76,30 +193,20 @@ def calculate_topic_score(
     # Learning gain: prioritize weak topics
     learning_gain = (1 - mastery) * weight
     
-    # Energy match: align difficulty with energy level
-    energy_match_map = {
-        "high": {"hard": 1.0, "medium": 0.7, "easy": 0.3},
-        "medium": {"hard": 0.5, "medium": 1.0, "easy": 0.7},
-        "low": {"hard": 0.2, "medium": 0.5, "easy": 1.0}
-    }
-    energy_match = energy_match_map.get(energy_level, {}).get(difficulty, 0.5)
-    
-    # Cognitive fit: some profiles handle certain difficulties better
-    cognitive_fit_map = {
-        "struggling": {"hard": 0.3, "medium": 0.7, "easy": 1.0},
-        "fast_careless": {"hard": 0.7, "medium": 1.0, "easy": 0.5},
-        "slow_accurate": {"hard": 1.0, "medium": 0.8, "easy": 0.5},
-        "balanced": {"hard": 0.8, "medium": 1.0, "easy": 0.8}
-    }
-    cognitive_fit = cognitive_fit_map.get(profile_type, {}).get(difficulty, 0.7)
+    multiplier = _SCORE_TABLE.get((energy_level, profile_type, difficulty))
+    if multiplier is None:
+        # Unknown level/profile/difficulty: fall back to the neutral defaults
+        energy_match = ENERGY_MATCH_MAP.get(energy_level, {}).get(difficulty, 0.5)
+        cognitive_fit = COGNITIVE_FIT_MAP.get(profile_type, {}).get(difficulty, 0.7)
+        multiplier = energy_match * cognitive_fit
     
-    return learning_gain * energy_match * cognitive_fit
+    return learning_gain * multiplier
 
 
 def generate_schedule(
     user_subjects: List[str],
     free_slots: List[str],
-    cognitive_events: List[Dict[str, Any]],
+    cognitive_events: Dict[str, np.ndarray],
     energy_score: int,
     topic_mastery: Optional[Dict[str, float]] = None,
     preferences: Optional[Dict[str, Any]] = None
@@ -119,47 +226,72 @@ def generate_schedule(
     Args:
         user_subjects: List of subjects user is studying
         free_slots: Available time slots (e.g., ["18:00-21:00"])
-        cognitive_events: Recent cognitive events for profile classification
+        cognitive_events: Recent cognitive events as columns (see cognitive.rows_to_arrays)
         energy_score: Current energy score (0-100)
         topic_mastery: Dict of topic -> mastery (0-1), defaults to 0.3
         preferences: User preferences for session duration, breaks
     
     Returns:
-        Complete study plan with slots
+        Complete study plan with slots (cognitive_profile is None when
+        there are no free slots or subjects)
     """
+    # Get energy level
+    energy_level = get_energy_level(energy_score)
+    
+    # Nothing to schedule: skip profiling and topic scoring entirely
+    if not free_slots or not user_subjects:
+        return {
+            "date": date.today().isoformat(),
+            "total_study_time": 0,
+            "estimated_learning_gain": 0,
+            "slots": [],
+            "cognitive_profile": None,
+            "energy_score": energy_score,
+            "energy_level": energy_level
+        }
+    
     # Default preferences
     prefs = preferences or {}
     max_session = prefs.get("max_session_duration", 60)  # minutes
     min_break = prefs.get("min_break", 15)  # minutes
     
     # Get cognitive profile
-    profile = classify_cognitive_profile(cognitive_events)
+    profile = _get_cognitive_profile(cognitive_events)
     profile_type = profile["type"]
     
-    # Get energy level
-    energy_level = get_energy_level(energy_score)
-    
     # Default topic mastery
     mastery = topic_mastery or {}
     
     # Collect all available topics from user's subjects
-    available_topics = []
-    for subject in user_subjects:
-        if subject in DEFAULT_TOPICS:
-            for topic in DEFAULT_TOPICS[subject]:
-                topic_key = f"{subject}:{topic['name']}"
-                topic_mastery_val = mastery.get(topic_key, 0.3)
-                available_topics.append({
-                    **topic,
-                    "subject": subject,
-                    "mastery": topic_mastery_val,
-                    "score": calculate_topic_score(
-                        topic, topic_mastery_val, energy_level, profile_type
-                    )
-                })
+    subject_ids = [
+        _SUBJECT_TOPIC_IDS[subject] for subject in user_subjects
+        if subject in _SUBJECT_TOPIC_IDS
+    ]
+    topic_ids = np.concatenate(subject_ids) if subject_ids else np.empty(0, dtype=np.intp)
+    topic_mastery_vals = np.fromiter(
+        (
+            mastery.get(f"{_TOPIC_SUBJECTS[i]}:{_TOPIC_NAMES[i]}", 0.3)
+            for i in topic_ids
+        ),
+        dtype=np.float64,
+        count=len(topic_ids)
+    )
     
-    # Sort by score (descending)
-    available_topics.sort(key=lambda x: x["score"], reverse=True)
+    # Score every topic at once: (1 - mastery) × weight × energy_match × cognitive_fit
+    multipliers = _SCORE_MULTIPLIERS.get((energy_level, profile_type))
+    if multipliers is None:
+        multipliers = np.array([
+            calculate_topic_score({"difficulty": d}, 0.0, energy_level, profile_type)
+            for d in _DIFFICULTIES
+        ])
+    scores = (1 - topic_mastery_vals) * _TOPIC_WEIGHTS[topic_ids] \
+        * multipliers[_TOPIC_DIFF_IDX[topic_ids]]
+    
+    # Sort by score (descending); stable so ties keep subject order
+    order = np.argsort(-scores, kind="stable")
+    ranked_ids = topic_ids[order].tolist()
+    ranked_mastery = topic_mastery_vals[order].tolist()
+    n_topics = len(ranked_ids)
     
     # Generate slots
     study_slots = []
@@ -167,6 +299,8 @@ def generate_schedule(
     fatigue_accumulator = 0
     last_topic = None
     consecutive_same = 0
+    # Rotate through the profile's study methods, one per slot
+    method_iter = cycle(METHODS_BY_PROFILE.get(profile_type, ("Problem Practice",)))
     
     for slot in free_slots:
         start_hour, end_hour = parse_time_slot(slot)
@@ -181,29 +315,36 @@ def generate_schedule(
                 fatigue_accumulator = 0
                 continue
             
-            # Find best topic for this slot
-            best_topic = None
-            for topic in available_topics:
-                # Constraint: No same topic > 2 consecutive slots
-                if topic["name"] == last_topic:
-                    consecutive_same += 1
-                    if consecutive_same > 2:
-                        continue
-                else:
-                    consecutive_same = 0
-                
-                best_topic = topic
+            # Find best topic for this slot. Scores are fixed for the whole
+            # schedule, so the best topic is always at the front.
+            if not n_topics:
                 break
+            idx = 0
+            # Constraint: No same topic > 2 consecutive slots
+            if _TOPIC_NAMES[ranked_ids[idx]] == last_topic and consecutive_same >= 2:
+                idx += 1
+                while idx < n_topics and _TOPIC_NAMES[ranked_ids[idx]] == last_topic:
+                    idx += 1
+                if idx == n_topics:
+                    break
+            topic_id = ranked_ids[idx]
+            best_topic = {
+                "name": _TOPIC_NAMES[topic_id],
+                "subject": _TOPIC_SUBJECTS[topic_id],
+                "difficulty": _DIFFICULTIES[_TOPIC_DIFF_IDX[topic_id]],
+                "mastery": ranked_mastery[idx]
+            }
             
-            if not best_topic:
-                break
+            if best_topic["name"] == last_topic:
+                consecutive_same += 1
+            else:
+                consecutive_same = 1
             
             # Create slot
             slot_duration = min(max_session, (end_hour - current_hour) * 60)
             
             # Get appropriate method
-            methods = METHODS_BY_PROFILE.get(profile_type, ["Problem Practice"])
-            method = methods[len(study_slots) % len(methods)]
+            method = next(method_iter)
             
             # Get intensity
             intensity = INTENSITY_BY_DIFFICULTY.get(
@@ -236,7 +377,7 @@ def generate_schedule(
     ) if study_slots else 0
     
     return {
-        "date": datetime.now().strftime("%Y-%m-%d"),
+        "date": date.today().isoformat(),
         "total_study_time": total_study_time,
         "estimated_learning_gain": round(estimated_gain, 2),
         "slots": study_slots,
@@ -252,25 +393,9 @@ def generate_rationale(
     profile_type: str
 ) -> str:
     """Generate human-readable rationale for slot assignment."""
-    energy_phrases = {
-        "high": "Peak energy",
-        "medium": "Moderate energy",
-        "low": "Low energy"
-    }
-    
-    mastery = topic.get("mastery", 0.3)
-    if mastery < 0.4:
-        strength = "weak topic"
-    elif mastery < 0.7:
-        strength = "developing topic"
-    else:
-        strength = "strong topic"
-    
-    profile_context = {
-        "struggling": "needs foundational review",
-        "fast_careless": "focus on accuracy",
-        "slow_accurate": "speed practice beneficial",
-        "balanced": "optimal learning conditions"
-    }
-    
-    return f"{energy_phrases[energy_level]} + {strength} - {profile_context.get(profile_type, '')}"
+    mastery_bucket = bisect_right(_MASTERY_BUCKETS, topic.get("mastery", 0.3))
+    rationale = _RATIONALE.get((energy_level, mastery_bucket, profile_type))
+    if rationale is None:
+        # Unknown profile type: keep the energy and strength parts
+        rationale = f"{_ENERGY_PHRASES[energy_level]} + {_STRENGTHS[mastery_bucket]} - "
+    return rationale
@@ -2,54 +2,157 @@
 FastAPI Application - NeuroAdaptive Study Engine MVP
 """
 
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import select, insert, update, exists, func, case, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import List
-from jose import JWTError, jwt
+from typing import List, Optional, Set
+import jwt
+from jwt.exceptions import InvalidTokenError as JWTError
+from cachetools import LRUCache, TTLCache
+import os
+import time
+import asyncio
+import logging
+import threading
+import hmac
+import hashlib
+import secrets
+import orjson
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 
-from database import engine, get_db, Base
+from database import engine, get_db, Base, SessionLocal
+from cache import cache, cached, REDIS_URL
 import models
 import schemas
-from engine.cognitive import classify_cognitive_profile
+from engine.cognitive import classify_cognitive_arrays, rows_to_arrays
 from engine.energy import calculate_energy_score, get_energy_level, get_energy_analysis
 from engine.scheduler import generate_schedule
 from engine.chatbot import generate_chat_response
-from engine.gemini_chat import generate_gemini_response
+from engine.gemini_chat import generate_gemini_response, render_prompt_context
 from pydantic import BaseModel
 
 class ChatRequest(BaseModel):
     message: str
 
 
+logger = logging.getLogger(__name__)
+
 # Create tables
 Base.metadata.create_all(bind=engine)
+# create_all skips indexes on tables that already exist; add any new ones
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+
+def normalize_stored_emails() -> Set[str]:
+    """
+    Lowercase emails stored before registration normalized them (EmailStr
+    only lowercased the domain), so exact-match login finds them.
+    
+    Run once at startup (see lifespan). Rows that would collide with
+    another account differing only in case are left unchanged and logged;
+    their lowercased emails are returned so login can match just those
+    case-insensitively.
+    """
+    with SessionLocal() as db:
+        mixed = db.execute(
+            select(models.User.id, models.User.email)
+            .where(models.User.email != func.lower(models.User.email))
+        ).all()
+        if not mixed:
+            return set()
+        
+        ids_by_email = defaultdict(list)
+        for user_id, email in mixed:
+            ids_by_email[email.lower()].append(user_id)
+        # Another row already holding the lowercase address is a conflict;
+        # a row from `mixed` that got there first (e.g. another worker
+        # migrating concurrently) is not
+        mixed_ids = [user_id for user_id, _ in mixed]
+        taken = set(db.execute(
+            select(models.User.email)
+            .where(models.User.email.in_(list(ids_by_email)))
+            .where(models.User.id.not_in(mixed_ids))
+        ).scalars())
+        
+        conflicts = set()
+        for email, ids in ids_by_email.items():
+            if len(ids) == 1 and email not in taken:
+                db.execute(update(models.User).where(models.User.id == ids[0]).values(email=email))
+            else:
+                conflicts.add(email)
+        db.commit()
+    
+    if conflicts:
+        logger.warning(
+            "Left %d user emails unnormalized (case-only duplicates): %s",
+            len(conflicts), sorted(conflicts)
+        )
+    return conflicts
+
+
+# Lowercased emails still shared by several accounts differing only in
+# case; filled in by lifespan
+CASE_CONFLICT_EMAILS: Set[str] = set()
+
+# INSERT ... ON CONFLICT support for the configured database
+upsert_insert = pg_insert if engine.dialect.name == "postgresql" else sqlite_insert
+
+# Password hashing: argon2id for new hashes. Calibrate the costs per deployment
+# (~100ms per hash on target hardware). Legacy bcrypt hashes still verify and
+# are upgraded to argon2id on the next successful login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "2"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "19456"))  # KiB
+pwd_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=1
+)
+
+# Verified against when the login email is unknown, so that path still does hashing work
+DUMMY_HASH = pwd_hasher.hash(secrets.token_urlsafe(16))
+
+# Failed logins take at least this long. Stored hashes mix legacy bcrypt
+# (~250-400ms) and argon2id (~30-100ms), so no single dummy check matches
+# every real failure; padding to a floor above the slowest scheme keeps
+# response time from revealing whether (or how) an email is registered.
+LOGIN_FAILURE_MIN_SECONDS = float(os.getenv("LOGIN_FAILURE_MIN_SECONDS", "0.5"))
+
+# Seed demo user at startup; set SEED_DEMO_USER=0 to skip it (e.g. in production)
+SEED_DEMO_USER = os.getenv("SEED_DEMO_USER", "1") == "1"
+
+# Minimum argon2 cost, intentionally, for the public demo identity only so
+# seeding adds ~nothing to cold start. The weak hash does not persist: it
+# fails check_needs_rehash and is upgraded on the demo user's first login.
+_demo_pwd_hasher = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1)
+
 
-# Seed demo user
 def create_demo_user():
-    from database import SessionLocal
-    db = SessionLocal()
-    try:
-        existing = db.query(models.User).filter(models.User.email == "demo@example.com").first()
-        if not existing:
-            demo_user = models.User(
-                name="Demo User",
-                email="demo@example.com",
-                hashed_password=bcrypt.hashpw("demo123".encode('utf-8'), bcrypt.gensalt()).decode('utf-8'),
-                subjects=["Mathematics", "Physics", "Chemistry"],
-                exam_date="2026-06-15",
-                daily_free_slots=["09:00-11:00", "14:00-16:00", "19:00-21:00"]
-            )
-            db.add(demo_user)
-            db.commit()
-            print("✅ Demo user created: demo@example.com / demo123")
-    finally:
-        db.close()
-
-create_demo_user()
+    with SessionLocal() as db:
+        if db.scalar(select(exists().where(models.User.email == "demo@example.com"))):
+            return
+        demo_user = models.User(
+            name="Demo User",
+            email="demo@example.com",
+            hashed_password=_demo_pwd_hasher.hash("demo123"),
+            subjects=["Mathematics", "Physics", "Chemistry"],
+            exam_date="2026-06-15",
+            daily_free_slots=["09:00-11:00", "14:00-16:00", "19:00-21:00"]
+        )
+        db.add(demo_user)
+        db.commit()
+        logger.info("Demo user created: demo@example.com / demo123")
 
 # JWT Settings
 SECRET_KEY = "neuroadaptive-secret-key-change-in-production"
@@ -58,8 +161,44 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Successfully decoded tokens -> (user_id, exp). Entries also expire with the
+# token itself; invalid tokens are never stored so they are always re-checked.
+_jwt_cache = TTLCache(maxsize=10_000, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+_jwt_cache_lock = threading.Lock()
+
+# user_id -> rendered Gemini prompt context, dropped when new events or
+# energy logs are recomputed (see recompute_profile / recompute_energy)
+_chat_context_cache = TTLCache(maxsize=5000, ttl=120)
+# user_id -> generation, bumped on every invalidation so a build that
+# started before it does not store its (stale) result
+_chat_context_gen = defaultdict(int)
+_chat_context_lock = threading.Lock()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    CASE_CONFLICT_EMAILS.update(normalize_stored_emails())
+    if SEED_DEMO_USER:
+        create_demo_user()
+    await cache.connect(REDIS_URL)
+    yield
+    await cache.close()
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    orjson-rendered JSON for endpoints that return plain dicts.
+    
+    Endpoints with a response_model are left on FastAPI's default class,
+    which serializes them straight to JSON bytes with pydantic-core.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="NeuroAdaptive Study Engine",
     description="Intelligent study optimization platform with behavior-driven, energy-aware study plans",
     version="1.0.0"
@@ -76,12 +215,43 @@ app.add_middleware(
 
 
 # --- Helper Functions ---
+# Successful verifications, keyed by a per-process HMAC of the password so
+# plaintext never sits in memory. Size-bounded and never persisted.
+_VERIFY_CACHE_KEY = secrets.token_bytes(32)
+_verified_passwords = LRUCache(maxsize=1024)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    # Encode once; the same bytes feed the cache key and the hash check
+    password_bytes = plain_password.encode('utf-8')
+    digest = hmac.new(_VERIFY_CACHE_KEY, password_bytes, hashlib.sha256).digest()
+    key = (digest, hashed_password)
+    if key in _verified_passwords:
+        return True
+    if _is_bcrypt_hash(hashed_password):
+        verified = bcrypt.checkpw(password_bytes, hashed_password.encode('utf-8'))
+    else:
+        try:
+            verified = pwd_hasher.verify(hashed_password, password_bytes)
+        except (VerificationError, InvalidHashError):
+            verified = False
+    if not verified:
+        return False
+    _verified_passwords[key] = True
+    return True
+
+
+def _is_bcrypt_hash(hashed_password: str) -> bool:
+    return hashed_password.startswith(("$2a$", "$2b$", "$2y$"))
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for legacy bcrypt hashes and argon2 hashes with outdated parameters."""
+    return _is_bcrypt_hash(hashed_password) or pwd_hasher.check_needs_rehash(hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return pwd_hasher.hash(password)
 
 
 def create_access_token(data: dict) -> str:
@@ -91,6 +261,35 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
+# Hot lookups built once so every request reuses SQLAlchemy's compiled-statement cache
+_STMT_USER_BY_ID = select(models.User).where(models.User.id == bindparam("uid"))
+_STMT_USER_BY_EMAIL = select(models.User).where(models.User.email == bindparam("email"))
+_STMT_USERS_BY_EMAIL_CI = select(models.User).where(func.lower(models.User.email) == bindparam("email"))
+_STMT_RECENT_EVENTS = select(models.CognitiveEvent)\
+    .where(models.CognitiveEvent.user_id == bindparam("uid"))\
+    .order_by(models.CognitiveEvent.timestamp.desc())\
+    .limit(bindparam("lim"))
+# The event id plus the columns the classifier reads, in rows_to_arrays order
+_STMT_RECENT_EVENT_COLUMNS = select(
+        models.CognitiveEvent.id,
+        models.CognitiveEvent.time_taken,
+        models.CognitiveEvent.correct,
+        func.coalesce(models.CognitiveEvent.retry_count, 0),
+        models.CognitiveEvent.confidence
+    )\
+    .where(models.CognitiveEvent.user_id == bindparam("uid"))\
+    .order_by(models.CognitiveEvent.timestamp.desc())\
+    .limit(bindparam("lim"))
+_STMT_LATEST_ENERGY = select(models.EnergyLog)\
+    .where(models.EnergyLog.user_id == bindparam("uid"))\
+    .order_by(models.EnergyLog.timestamp.desc())\
+    .limit(1)
+_STMT_PLAN_HISTORY = select(models.StudyPlan)\
+    .where(models.StudyPlan.user_id == bindparam("uid"))\
+    .order_by(models.StudyPlan.created_at.desc())\
+    .limit(bindparam("lim"))
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -100,76 +299,195 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id = payload.get("sub")
-
-        if user_id is None:
+    with _jwt_cache_lock:
+        cached = _jwt_cache.get(token)
+    if cached is not None and cached[1] > time.time():
+        user_id = cached[0]
+    else:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            user_id = payload.get("sub")
+
+            if user_id is None:
+                raise credentials_exception
+            user_id = int(user_id)
+        except JWTError:
             raise credentials_exception
-        user_id = int(user_id)
-    except JWTError:
-        raise credentials_exception
+
+        exp = payload.get("exp")
+        if exp is not None:
+            with _jwt_cache_lock:
+                _jwt_cache[token] = (user_id, exp)
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = db.execute(_STMT_USER_BY_ID, {"uid": user_id}).scalar_one_or_none()
     if user is None:
         raise credentials_exception
     return user
 
+def get_recent_events(db: Session, user_id: int, limit: int = 20) -> List[models.CognitiveEvent]:
+    """Most recent cognitive events for a user, newest first."""
+    return db.execute(_STMT_RECENT_EVENTS, {"uid": user_id, "lim": limit}).scalars().all()
+
+
+def get_recent_event_arrays(db: Session, user_id: int, limit: int = 20) -> dict:
+    """Classifier inputs for a user's most recent events, as NumPy columns."""
+    rows = db.execute(_STMT_RECENT_EVENT_COLUMNS, {"uid": user_id, "lim": limit}).all()
+    return rows_to_arrays(rows)
+
+
+def get_latest_energy_log(db: Session, user_id: int) -> Optional[models.EnergyLog]:
+    """Most recent energy log for a user, if any."""
+    return db.execute(_STMT_LATEST_ENERGY, {"uid": user_id}).scalars().first()
+
+
+# List endpoints clamp `limit` to [0, MAX_LIST_LIMIT] and stream anything above
+# STREAM_THRESHOLD rows instead of hydrating the whole result up front
+MAX_LIST_LIMIT = 500
+STREAM_THRESHOLD = 50
+
+
+def stream_json_array(stmt, params: dict, serialize) -> StreamingResponse:
+    """
+    Stream a select as a JSON array, fetching rows in batches of 100.
+    
+    Uses its own session because the response body is produced after the
+    endpoint (and its request-scoped session) has returned.
+    """
+    def body():
+        with SessionLocal() as db:
+            rows = db.execute(stmt.execution_options(yield_per=100), params).scalars()
+            yield b"["
+            for i, row in enumerate(rows):
+                if i:
+                    yield b","
+                yield orjson.dumps(serialize(row))
+            yield b"]"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def event_to_dict(e: models.CognitiveEvent) -> dict:
+    return {
+        "id": e.id,
+        "question_id": e.question_id,
+        "subject": e.subject,
+        "time_taken": e.time_taken,
+        "correct": e.correct,
+        "confidence": e.confidence,
+        "timestamp": e.timestamp
+    }
+
+
+def plan_summary(p: models.StudyPlan) -> dict:
+    return {
+        "id": p.id,
+        "date": p.date,
+        "cognitive_profile": p.cognitive_profile,
+        "energy_score": p.energy_score,
+        "created_at": p.created_at
+    }
+
+
+def load_cognitive_profile(db: Session, user_id: int) -> Optional[dict]:
+    """Classify the user's recent events; None until they have any."""
+    arrays = get_recent_event_arrays(db, user_id)
+    if not arrays["times"].size:
+        return None
+    return classify_cognitive_arrays(arrays)
+
+
+def load_energy_state(db: Session, user_id: int) -> Optional[dict]:
+    """Energy analysis for the user's latest log; None until they log one."""
+    energy_log = get_latest_energy_log(db, user_id)
+    if not energy_log:
+        return None
+    return get_energy_analysis(energy_log.sleep_hours, energy_log.tiredness)
+
+
+def invalidate_chat_context(user_id: int):
+    with _chat_context_lock:
+        _chat_context_gen[user_id] += 1
+        _chat_context_cache.pop(user_id, None)
+
+
+# Chat context is kept warm in Redis under profile:{uid} / energy:{uid} (no TTL).
+# Submits refresh it in a background task after the response is sent; the
+# rendered prompt is dropped once Redis holds the new values, and a build
+# already in flight when that happens is not cached (see _chat_context_gen).
+async def recompute_profile(user_id: int):
+    if not cache.enabled:
+        # Nowhere to keep the result; the next chat turn reads the DB anyway
+        invalidate_chat_context(user_id)
+        return
+    with SessionLocal() as db:
+        profile = load_cognitive_profile(db, user_id)
+    if profile is not None:
+        await cache.set(f"profile:{user_id}", profile)
+    invalidate_chat_context(user_id)
+
+
+async def recompute_energy(user_id: int):
+    if not cache.enabled:
+        invalidate_chat_context(user_id)
+        return
+    with SessionLocal() as db:
+        energy_state = load_energy_state(db, user_id)
+    if energy_state is not None:
+        await cache.set(f"energy:{user_id}", energy_state)
+    invalidate_chat_context(user_id)
+
+
+async def build_chat_context(db: Session, user_id: int) -> str:
+    """Rendered prompt context for a user: in-process cache, then Redis, then the DB."""
+    with _chat_context_lock:
+        prompt_context = _chat_context_cache.get(user_id)
+        generation = _chat_context_gen[user_id]
+    if prompt_context is not None:
+        return prompt_context
+
+    # --- cognitive context ---
+    cognitive_profile = await cache.get(f"profile:{user_id}")
+    if cognitive_profile is None:
+        cognitive_profile = load_cognitive_profile(db, user_id)
+        if cognitive_profile is not None:
+            await cache.set(f"profile:{user_id}", cognitive_profile)
+
+    # --- energy context ---
+    energy_state = await cache.get(f"energy:{user_id}")
+    if energy_state is None:
+        energy_state = load_energy_state(db, user_id)
+        if energy_state is not None:
+            await cache.set(f"energy:{user_id}", energy_state)
+
+    prompt_context = render_prompt_context({
+        "cognitive_profile": cognitive_profile,
+        "energy": energy_state
+    })
+    with _chat_context_lock:
+        if _chat_context_gen[user_id] == generation:
+            _chat_context_cache[user_id] = prompt_context
+    return prompt_context
+
 # --- Chatbot Endpoint ---
-@app.post("/chat/message")
+@app.post("/chat/message", response_class=ORJSONResponse)
 async def chat_message(
     payload: ChatRequest,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
     message = payload.message
-    print("📨 Chat message:", message)
-
-    # --- cognitive context ---
-    events = db.query(models.CognitiveEvent)\
-        .filter(models.CognitiveEvent.user_id == current_user.id)\
-        .order_by(models.CognitiveEvent.timestamp.desc())\
-        .limit(20)\
-        .all()
-
-    cognitive_profile = None
-    if events:
-        cognitive_profile = classify_cognitive_profile([
-            {
-                "time_taken": e.time_taken,
-                "correct": e.correct,
-                "confidence": e.confidence,
-                "retry_count": e.retry_count
-            } for e in events
-        ])
-
-    # --- energy context ---
-    energy_log = db.query(models.EnergyLog)\
-        .filter(models.EnergyLog.user_id == current_user.id)\
-        .order_by(models.EnergyLog.timestamp.desc())\
-        .first()
-
-    energy_state = None
-    if energy_log:
-        energy_state = get_energy_analysis(
-            energy_log.sleep_hours,
-            energy_log.tiredness
-        )
+    # %-style args are only formatted when DEBUG is enabled
+    logger.debug("Chat message from user %s: %s", current_user.id, message)
 
-    reply = generate_gemini_response(
-        message,
-        {
-            "cognitive_profile": cognitive_profile,
-            "energy": energy_state
-        }
-    )
-    print("🤖 Gemini reply:", reply)
+    prompt_context = await build_chat_context(db, current_user.id)
+    reply = await generate_gemini_response(message, prompt_context)
+    logger.debug("Gemini reply to user %s: %s", current_user.id, reply)
 
 
     return {"reply": reply}
 
 # --- Health Check ---
-@app.get("/health")
+@app.get("/health", response_class=ORJSONResponse)
 async def health_check():
     return {"status": "healthy", "service": "NeuroAdaptive Study Engine", "version": "1.0.0"}
 
@@ -177,23 +495,18 @@ async def health_check():
 # --- Auth Endpoints ---
 @app.post("/auth/register", response_model=schemas.UserResponse)
 async def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    # Check if email exists
-    existing = db.query(models.User).filter(models.User.email == user.email).first()
-    if existing:
+    data = user.model_dump(exclude={"password"})
+    # Atomic duplicate check: no row comes back if the email is already taken
+    user_id = db.execute(
+        upsert_insert(models.User)
+        .values(hashed_password=get_password_hash(user.password), **data)
+        .on_conflict_do_nothing(index_elements=[models.User.email])
+        .returning(models.User.id)
+    ).scalar_one_or_none()
+    if user_id is None:
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    db_user = models.User(
-        name=user.name,
-        email=user.email,
-        hashed_password=get_password_hash(user.password),
-        subjects=user.subjects,
-        exam_date=user.exam_date,
-        daily_free_slots=user.daily_free_slots
-    )
-    db.add(db_user)
     db.commit()
-    db.refresh(db_user)
-    return db_user
+    return {"id": user_id, **data}
 
 
 @app.post("/auth/login", response_model=schemas.Token)
@@ -201,13 +514,31 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    started = time.perf_counter()
+    email = form_data.username.strip().lower()
+    if email in CASE_CONFLICT_EMAILS:
+        # Case-only duplicates from before normalization: match
+        # case-insensitively and take whichever account the password fits
+        candidates = db.execute(_STMT_USERS_BY_EMAIL_CI, {"email": email}).scalars().all()
+    else:
+        candidates = db.execute(_STMT_USER_BY_EMAIL, {"email": email}).scalars().all()
+    if not candidates:
+        verify_password(form_data.password, DUMMY_HASH)
+    user = next((u for u in candidates if verify_password(form_data.password, u.hashed_password)), None)
+    if not user:
+        remaining = LOGIN_FAILURE_MIN_SECONDS - (time.perf_counter() - started)
+        if remaining > 0:
+            await asyncio.sleep(remaining)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
+    # Opportunistically upgrade legacy bcrypt / outdated argon2 hashes
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(form_data.password)
+        db.commit()
+    
     access_token = create_access_token(data={"sub": str(user.id)})
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -221,21 +552,48 @@ async def get_me(current_user: models.User = Depends(get_current_user)):
 @app.post("/cognitive/submit", response_model=schemas.CognitiveEventResponse)
 async def submit_cognitive_event(
     event: schemas.CognitiveEventCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_event = models.CognitiveEvent(
-        user_id=current_user.id,
-        question_id=event.question_id,
-        subject=event.subject,
-        time_taken=event.time_taken,
-        correct=event.correct,
-        confidence=event.confidence
+    data = event.model_dump()
+    # RETURNING hands back the generated id and timestamp without a refresh SELECT
+    row = db.execute(
+        insert(models.CognitiveEvent)
+        .values(user_id=current_user.id, **data)
+        .returning(models.CognitiveEvent.id, models.CognitiveEvent.timestamp)
+    ).one()
+    db.commit()
+    await cache.delete(
+        get_cognitive_profile.key_for(current_user.id),
+        get_performance_analytics.key_for(current_user.id)
+    )
+    background_tasks.add_task(recompute_profile, current_user.id)
+    return {"id": row.id, "timestamp": row.timestamp, **data}
+
+
+@app.post("/cognitive/submit_batch", response_class=ORJSONResponse)
+async def submit_cognitive_events_batch(
+    events: List[schemas.CognitiveEventCreate],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user)
+):
+    if not events:
+        return {"message": "No events submitted", "count": 0}
+
+    # One executemany round trip instead of a unit-of-work flush per row
+    db.execute(
+        insert(models.CognitiveEvent),
+        [{"user_id": current_user.id, **e.model_dump()} for e in events]
     )
-    db.add(db_event)
     db.commit()
-    db.refresh(db_event)
-    return db_event
+    await cache.delete(
+        get_cognitive_profile.key_for(current_user.id),
+        get_performance_analytics.key_for(current_user.id)
+    )
+    background_tasks.add_task(recompute_profile, current_user.id)
+    return {"message": "Events submitted successfully", "count": len(events)}
 
 
 @app.get("/cognitive/events", response_model=List[schemas.CognitiveEventResponse])
@@ -244,37 +602,20 @@ async def get_cognitive_events(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    events = db.query(models.CognitiveEvent)\
-        .filter(models.CognitiveEvent.user_id == current_user.id)\
-        .order_by(models.CognitiveEvent.timestamp.desc())\
-        .limit(limit)\
-        .all()
+    limit = max(0, min(limit, MAX_LIST_LIMIT))
+    if limit > STREAM_THRESHOLD:
+        return stream_json_array(_STMT_RECENT_EVENTS, {"uid": current_user.id, "lim": limit}, event_to_dict)
+    events = get_recent_events(db, current_user.id, limit)
     return events
 
 
-@app.get("/cognitive/profile")
+@app.get("/cognitive/profile", response_class=ORJSONResponse)
+@cached(prefix="cogprof", expire=60)
 async def get_cognitive_profile(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    events = db.query(models.CognitiveEvent)\
-        .filter(models.CognitiveEvent.user_id == current_user.id)\
-        .order_by(models.CognitiveEvent.timestamp.desc())\
-        .limit(20)\
-        .all()
-    
-    # Convert to dict for engine
-    events_data = [
-        {
-            "time_taken": e.time_taken,
-            "correct": e.correct,
-            "confidence": e.confidence,
-            "retry_count": e.retry_count
-        }
-        for e in events
-    ]
-    
-    profile = classify_cognitive_profile(events_data)
+    profile = classify_cognitive_arrays(get_recent_event_arrays(db, current_user.id))
     return profile
 
 
@@ -282,31 +623,34 @@ async def get_cognitive_profile(
 @app.post("/energy/submit", response_model=schemas.EnergyLogResponse)
 async def submit_energy_log(
     log: schemas.EnergyLogCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_log = models.EnergyLog(
-        user_id=current_user.id,
-        sleep_hours=log.sleep_hours,
-        tiredness=log.tiredness,
-        timestamp=log.timestamp or datetime.utcnow()
-    )
-    db.add(db_log)
+    data = {
+        "sleep_hours": log.sleep_hours,
+        "tiredness": log.tiredness,
+        "timestamp": log.timestamp or datetime.utcnow()
+    }
+    log_id = db.execute(
+        insert(models.EnergyLog)
+        .values(user_id=current_user.id, **data)
+        .returning(models.EnergyLog.id)
+    ).scalar_one()
     db.commit()
-    db.refresh(db_log)
-    return db_log
+    await cache.delete(get_current_energy.key_for(current_user.id))
+    background_tasks.add_task(recompute_energy, current_user.id)
+    return {"id": log_id, **data}
 
 
-@app.get("/energy/current")
+@app.get("/energy/current", response_class=ORJSONResponse)
+@cached(prefix="energy", expire=60)
 async def get_current_energy(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
     # Get most recent energy log
-    latest = db.query(models.EnergyLog)\
-        .filter(models.EnergyLog.user_id == current_user.id)\
-        .order_by(models.EnergyLog.timestamp.desc())\
-        .first()
+    latest = get_latest_energy_log(db, current_user.id)
     
     if not latest:
         return {"message": "No energy data available", "energy_score": 50, "energy_level": "medium"}
@@ -323,27 +667,10 @@ async def generate_study_plan(
     current_user: models.User = Depends(get_current_user)
 ):
     # Get cognitive events
-    events = db.query(models.CognitiveEvent)\
-        .filter(models.CognitiveEvent.user_id == current_user.id)\
-        .order_by(models.CognitiveEvent.timestamp.desc())\
-        .limit(20)\
-        .all()
-    
-    events_data = [
-        {
-            "time_taken": e.time_taken,
-            "correct": e.correct,
-            "confidence": e.confidence,
-            "retry_count": e.retry_count
-        }
-        for e in events
-    ]
+    event_arrays = get_recent_event_arrays(db, current_user.id)
     
     # Get latest energy
-    latest_energy = db.query(models.EnergyLog)\
-        .filter(models.EnergyLog.user_id == current_user.id)\
-        .order_by(models.EnergyLog.timestamp.desc())\
-        .first()
+    latest_energy = get_latest_energy_log(db, current_user.id)
     
     energy_score = 50  # Default
     if latest_energy:
@@ -363,7 +690,7 @@ async def generate_study_plan(
     schedule = generate_schedule(
         user_subjects=current_user.subjects,
         free_slots=free_slots,
-        cognitive_events=events_data,
+        cognitive_events=event_arrays,
         energy_score=energy_score,
         preferences=preferences
     )
@@ -381,12 +708,15 @@ async def generate_study_plan(
     
     # Format response
     return {
-        "cognitive_profile": schemas.CognitiveProfile(**schedule["cognitive_profile"]),
+        "cognitive_profile": (
+            schemas.CognitiveProfile(**schedule["cognitive_profile"])
+            if schedule["cognitive_profile"] else None
+        ),
         "energy_score": schedule["energy_score"],
         "energy_level": schedule["energy_level"],
         "study_plan": [schemas.StudySlot(**slot) for slot in schedule["slots"]],
         "metadata": {
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": datetime.utcnow(),
             "model_version": "v1.0.0-rules",
             "total_study_time": schedule["total_study_time"],
             "estimated_learning_gain": schedule["estimated_learning_gain"]
@@ -394,87 +724,70 @@ async def generate_study_plan(
     }
 
 
-@app.get("/plan/history")
+@app.get("/plan/history", response_class=ORJSONResponse)
 async def get_plan_history(
     limit: int = 10,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    plans = db.query(models.StudyPlan)\
-        .filter(models.StudyPlan.user_id == current_user.id)\
-        .order_by(models.StudyPlan.created_at.desc())\
-        .limit(limit)\
-        .all()
+    limit = max(0, min(limit, MAX_LIST_LIMIT))
+    params = {"uid": current_user.id, "lim": limit}
+    if limit > STREAM_THRESHOLD:
+        return stream_json_array(_STMT_PLAN_HISTORY, params, plan_summary)
+    plans = db.execute(_STMT_PLAN_HISTORY, params).scalars().all()
     
-    return [
-        {
-            "id": p.id,
-            "date": p.date,
-            "cognitive_profile": p.cognitive_profile,
-            "energy_score": p.energy_score,
-            "created_at": p.created_at.isoformat()
-        }
-        for p in plans
-    ]
+    return [plan_summary(p) for p in plans]
 
 
 # --- Feedback ---
-@app.post("/feedback/submit")
+@app.post("/feedback/submit", response_class=ORJSONResponse)
 async def submit_feedback(
     feedback: schemas.FeedbackCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    db_feedback = models.Feedback(
-        user_id=current_user.id,
-        plan_id=feedback.plan_id,
-        slot_index=feedback.slot_index,
-        completion_rate=feedback.completion_rate,
-        difficulty=feedback.difficulty,
-        actual_time=feedback.actual_time,
-        quiz_score=feedback.quiz_score
-    )
-    db.add(db_feedback)
+    feedback_id = db.execute(
+        insert(models.Feedback)
+        .values(user_id=current_user.id, **feedback.model_dump())
+        .returning(models.Feedback.id)
+    ).scalar_one()
     db.commit()
-    db.refresh(db_feedback)
-    return {"message": "Feedback submitted successfully", "id": db_feedback.id}
+    return {"message": "Feedback submitted successfully", "id": feedback_id}
 
 
 # --- Analytics ---
-@app.get("/analytics/performance")
+@app.get("/analytics/performance", response_class=ORJSONResponse)
+@cached(prefix="analytics", expire=60)
 async def get_performance_analytics(
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
-    # Get cognitive events for trend analysis
-    events = db.query(models.CognitiveEvent)\
-        .filter(models.CognitiveEvent.user_id == current_user.id)\
-        .order_by(models.CognitiveEvent.timestamp.asc())\
-        .all()
+    # Aggregate per day in the database instead of loading every event
+    day = func.date(models.CognitiveEvent.timestamp).label("day")
+    daily_stats = db.execute(
+        select(
+            day,
+            func.count().label("total"),
+            func.sum(case((models.CognitiveEvent.correct, 1), else_=0)).label("correct"),
+            func.sum(models.CognitiveEvent.time_taken).label("total_time")
+        )
+        .where(models.CognitiveEvent.user_id == current_user.id)
+        .group_by(day)
+        .order_by(day)
+    ).all()
     
-    if not events:
+    if not daily_stats:
         return {"message": "No data available", "data": []}
     
-    # Group by date
-    daily_stats = {}
-    for e in events:
-        date_key = e.timestamp.strftime("%Y-%m-%d")
-        if date_key not in daily_stats:
-            daily_stats[date_key] = {"correct": 0, "total": 0, "total_time": 0}
-        daily_stats[date_key]["total"] += 1
-        daily_stats[date_key]["total_time"] += e.time_taken
-        if e.correct:
-            daily_stats[date_key]["correct"] += 1
-    
     # Format for charts
     chart_data = [
         {
-            "date": date,
-            "accuracy": round(stats["correct"] / stats["total"] * 100, 1),
-            "avg_time": round(stats["total_time"] / stats["total"], 1),
-            "questions": stats["total"]
+            "date": str(row.day),
+            "accuracy": round(row.correct / row.total * 100, 1),
+            "avg_time": round(row.total_time / row.total, 1),
+            "questions": row.total
         }
-        for date, stats in daily_stats.items()
+        for row in daily_stats
     ]
     
     return {"data": chart_data}
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
 
+# Native text[] on PostgreSQL (no JSON decode on read); JSON elsewhere, e.g. SQLite
+StringList = JSON().with_variant(ARRAY(String), "postgresql")
+
 
 class User(Base):
     __tablename__ = "users"
@@ -11,14 +15,25 @@ class User(Base):
     name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
-    subjects = Column(JSON, default=[])
+    subjects = Column(StringList, default=list)
     exam_date = Column(String, nullable=True)
-    daily_free_slots = Column(JSON, default=[])
+    daily_free_slots = Column(StringList, default=list)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    cognitive_events = relationship("CognitiveEvent", back_populates="user")
-    energy_logs = relationship("EnergyLog", back_populates="user")
-    study_plans = relationship("StudyPlan", back_populates="user")
+    # Newest first. Lazy loads raise so a user's whole history is never
+    # pulled in by accident; use the bounded queries in main.py instead.
+    cognitive_events = relationship(
+        "CognitiveEvent", back_populates="user",
+        order_by="CognitiveEvent.timestamp.desc()", lazy="raise_on_sql"
+    )
+    energy_logs = relationship(
+        "EnergyLog", back_populates="user",
+        order_by="EnergyLog.timestamp.desc()", lazy="raise_on_sql"
+    )
+    study_plans = relationship(
+        "StudyPlan", back_populates="user",
+        order_by="StudyPlan.created_at.desc()", lazy="raise_on_sql"
+    )
 
 
 class CognitiveEvent(Base):
@@ -36,6 +51,11 @@ class CognitiveEvent(Base):
 
     user = relationship("User", back_populates="cognitive_events")
 
+    # Serves the per-user newest-first scans (recent events, daily analytics)
+    __table_args__ = (
+        Index("ix_cognitive_events_user_id_timestamp", "user_id", timestamp.desc()),
+    )
+
 
 class EnergyLog(Base):
     __tablename__ = "energy_logs"
@@ -48,6 +68,11 @@ class EnergyLog(Base):
 
     user = relationship("User", back_populates="energy_logs")
 
+    # Serves the latest-log lookup
+    __table_args__ = (
+        Index("ix_energy_logs_user_id_timestamp", "user_id", timestamp.desc()),
+    )
+
 
 class StudyPlan(Base):
     __tablename__ = "study_plans"
@@ -62,6 +87,11 @@ class StudyPlan(Base):
 
     user = relationship("User", back_populates="study_plans")
 
+    # Serves plan history
+    __table_args__ = (
+        Index("ix_study_plans_user_id_created_at", "user_id", created_at.desc()),
+    )
+
 
 class Feedback(Base):
     __tablename__ = "feedback"
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
+from typing import Optional, List, Dict
 from datetime import datetime
 
 
@@ -12,6 +12,13 @@ class UserCreate(BaseModel):
     exam_date: Optional[str] = None
     daily_free_slots: List[str] = []
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v: str) -> str:
+        # EmailStr only lowercases the domain; store the whole address
+        # lowercased so the unique index and login lookups agree
+        return v.lower()
+
 
 class UserResponse(BaseModel):
     id: int
@@ -21,8 +28,7 @@ class UserResponse(BaseModel):
     exam_date: Optional[str]
     daily_free_slots: List[str]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class Token(BaseModel):
@@ -48,8 +54,7 @@ class CognitiveEventResponse(BaseModel):
     confidence: int
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Energy Log Schemas ---
@@ -65,8 +70,7 @@ class EnergyLogResponse(BaseModel):
     tiredness: int
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Study Plan Schemas ---
@@ -93,18 +97,24 @@ class StudySlot(BaseModel):
 class CognitiveProfile(BaseModel):
     type: str
     confidence: float
-    features: dict
+    features: Dict[str, float]
+
+
+class PlanMetadata(BaseModel):
+    generated_at: datetime
+    model_version: str
+    total_study_time: int
+    estimated_learning_gain: float
 
 
 class StudyPlanResponse(BaseModel):
-    cognitive_profile: CognitiveProfile
+    cognitive_profile: Optional[CognitiveProfile]
     energy_score: int
     energy_level: str
     study_plan: List[StudySlot]
-    metadata: dict
+    metadata: PlanMetadata
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Feedback Schemas ---
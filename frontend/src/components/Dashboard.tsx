@@ -23,7 +23,7 @@ interface PlanHistoryItem {
         type: string;
         confidence: number;
         features: any;
-    };
+    } | null;
     energy_score: number;
     created_at: string;
 }
@@ -314,7 +314,7 @@ export default function Dashboard() {
                                     <div>
                                         <p className="text-white font-medium">{plan.date}</p>
                                         <p className="text-sm text-gray-400">
-                                            {plan.cognitive_profile.type} • Energy: {plan.energy_score}
+                                            {plan.cognitive_profile?.type ?? 'N/A'} • Energy: {plan.energy_score}
                                         </p>
                                     </div>
                                     <p className="text-xs text-gray-500">
@@ -15,7 +15,7 @@ interface StudyPlan {
     cognitive_profile: {
         type: string;
         confidence: number;
-    };
+    } | null;
     energy_score: number;
     energy_level: string;
     study_plan: StudySlot[];
@@ -257,11 +257,13 @@ export default function Schedule() {
                                     <div className="text-center">
                                         <p className="text-sm text-gray-400 mb-1">Cognitive Profile</p>
                                         <p className="text-lg font-bold text-sky-400">
-                                            {generatedPlan.cognitive_profile.type}
-                                        </p>
-                                        <p className="text-xs text-gray-500">
-                                            {(generatedPlan.cognitive_profile.confidence * 100).toFixed(0)}% confidence
+                                            {generatedPlan.cognitive_profile?.type ?? 'N/A'}
                                         </p>
+                                        {generatedPlan.cognitive_profile && (
+                                            <p className="text-xs text-gray-500">
+                                                {(generatedPlan.cognitive_profile.confidence * 100).toFixed(0)}% confidence
+                                            </p>
+                                        )}
                                     </div>
 
                                     <div className="text-center">